@@ -16,8 +16,9 @@ from .csv_writer import CSVWriter
 @click.option('-f', '--file', 'output_file', type=str, help='Specify filename to save results.')
 @click.option('--max-results', type=int, default=100, help='Maximum number of results to fetch.')
 @click.option('--email', type=str, default='user@example.com', help='Email for PubMed API requests.')
+@click.option('--api-key', type=str, default=None, help='NCBI API key (allows faster request rates).')
 def main(query: str, show_help: bool, debug: bool, output_file: Optional[str], 
-         max_results: int, email: str) -> None:
+         max_results: int, email: str, api_key: Optional[str]) -> None:
     """
     Fetch research papers from PubMed with pharmaceutical/biotech company affiliations.
     
@@ -34,12 +35,14 @@ def main(query: str, show_help: bool, debug: bool, output_file: Optional[str],
         ctx.exit()
     
     # Set up logging
-    if debug:
-        logging.basicConfig(level=logging.DEBUG)
+    logging.basicConfig(
+        level=logging.DEBUG if debug else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     
     try:
         # Initialize fetcher
-        fetcher = PubMedFetcher(email=email, debug=debug)
+        fetcher = PubMedFetcher(email=email, api_key=api_key)
         
         # Fetch papers
         click.echo(f"Searching PubMed for: {query}")
@@ -53,13 +56,14 @@ def main(query: str, show_help: bool, debug: bool, output_file: Optional[str],
         
         # Output results
         if output_file:
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            with open(output_file, 'wb') as f:
                 CSVWriter.write_results(papers, f)
             click.echo(f"Results saved to {output_file}")
         else:
-            # Print to console
-            csv_output = CSVWriter.format_results_string(papers)
-            click.echo(csv_output)
+            # Print to console; stream rows straight to stdout rather than
+            # building the whole CSV in memory first
+            CSVWriter.write_results(papers, sys.stdout, lineterminator="\n")
+            sys.stdout.flush()
     
     except PubMedAPIError as e:
         click.echo(f"Error: {e}", err=True)
@@ -1,49 +1,243 @@
 """Company detection utilities for identifying pharmaceutical/biotech affiliations."""
 
 import re
-from typing import List, Set, Optional
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 import logging
 
+try:
+    import ahocorasick
+except ImportError:  # optional speedup, see the "fast" extra
+    ahocorasick = None
+
+
+# Known pharmaceutical and biotech companies
+KNOWN_COMPANIES: FrozenSet[str] = frozenset({
+    # Major pharmaceutical companies
+    "pfizer", "johnson & johnson", "j&j", "roche", "novartis", "merck", "sanofi",
+    "glaxosmithkline", "gsk", "astrazeneca", "bristol myers squibb", "bms",
+    "abbott", "amgen", "gilead", "biogen", "celgene", "regeneron", "moderna",
+    "biontech", "vertex", "alexion", "incyte", "illumina", "thermo fisher",
+    
+    # Biotech companies
+    "genentech", "immunogen", "seattle genetics", "biomarin", "alkermes",
+    "bluebird bio", "crispr therapeutics", "editas medicine", "intellia",
+    "sangamo", "alnylam", "ionis", "sarepta", "exelixis", "neurocrine",
+    
+    # Generic indicators
+    "pharmaceuticals", "pharmaceutical", "pharma", "biotech", "biotechnology",
+    "therapeutics", "biosciences", "life sciences", "drug discovery"
+})
+
+# Academic institution indicators
+ACADEMIC_INDICATORS: FrozenSet[str] = frozenset({
+    "university", "college", "institute", "school", "hospital", "medical center",
+    "research center", "academic", "faculty", "department", "lab", "laboratory"
+})
+
+# Email domains for companies
+COMPANY_EMAIL_DOMAINS: FrozenSet[str] = frozenset({
+    "pfizer.com", "jnj.com", "roche.com", "novartis.com",
+    "merck.com", "sanofi.com", "gsk.com", "astrazeneca.com",
+    "bms.com", "abbott.com", "amgen.com", "gilead.com",
+    "biogen.com", "regeneron.com", "modernatx.com",
+    "biontech.de", "vrtx.com", "thermofisher.com"
+})
+
+_WORD_RE = re.compile(r'\S+')
+_COMPANY_SUFFIXES = ('inc', 'corp', 'ltd', 'llc')
+
+# Shared result for every non-company affiliation
+_NOT_COMPANY: Tuple[bool, Tuple[str, ...]] = (False, ())
+
+
+class _KeywordMatcher:
+    """
+    Finds which of a fixed set of keywords occur in a string, in a single scan.
+    
+    Uses an Aho-Corasick automaton when pyahocorasick is installed and otherwise
+    falls back to one compiled regex alternation. Both report the same keywords;
+    pass use_automaton to pick a backend explicitly. Forcing the automaton
+    without pyahocorasick installed raises ImportError.
+    """
+    
+    def __init__(self, keywords: Iterable[str], use_automaton: Optional[bool] = None) -> None:
+        # Longest first, so the regex reports the longest keyword at each position
+        self.keywords = sorted(set(keywords), key=len, reverse=True)
+        # Text shorter than every keyword cannot match; reject it before scanning
+        self._min_length = len(self.keywords[-1]) if self.keywords else 0
+        
+        if use_automaton is None:
+            use_automaton = ahocorasick is not None
+        elif use_automaton and ahocorasick is None:
+            raise ImportError(
+                "use_automaton=True requires pyahocorasick; install the 'fast' extra"
+            )
+        
+        if use_automaton:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            # A lookahead matches at every position, so overlapping hits are kept
+            self._regex = re.compile("(?=(" + "|".join(map(re.escape, self.keywords)) + "))")
+            # Shorter keywords hidden inside a longer hit, with their offsets
+            self._contained = {
+                keyword: [(keyword.index(other), other) for other in self.keywords if other in keyword]
+                for keyword in self.keywords
+            }
+    
+    def _occurrences(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield (start, keyword) for every keyword occurrence in text."""
+        if self._automaton is not None:
+            for end, keyword in self._automaton.iter(text):
+                yield end - len(keyword) + 1, keyword
+        else:
+            for match in self._regex.finditer(text):
+                for offset, keyword in self._contained[match.group(1)]:
+                    yield match.start() + offset, keyword
+    
+    def find_positions(self, text: str) -> Dict[str, int]:
+        """Map each keyword occurring in text to its first start, ordered by position."""
+        first_seen: Dict[str, int] = {}
+        if len(text) < self._min_length:
+            return first_seen
+        for start, keyword in self._occurrences(text):
+            if start < first_seen.get(keyword, len(text)):
+                first_seen[keyword] = start
+        # Longer keywords first when several start at the same position
+        ordered = sorted(first_seen, key=lambda keyword: (first_seen[keyword], -len(keyword)))
+        return {keyword: first_seen[keyword] for keyword in ordered}
+    
+    def count(self, text: str) -> int:
+        """Return how many distinct keywords occur in text."""
+        if len(text) < self._min_length:
+            return 0
+        return len({keyword for _, keyword in self._occurrences(text)})
+
+
+# Multi-pattern matchers: one scan finds every known keyword
+_COMPANY_MATCHER = _KeywordMatcher(KNOWN_COMPANIES)
+_ACADEMIC_MATCHER = _KeywordMatcher(ACADEMIC_INDICATORS)
+
+# Compiled once so the per-author checks don't go through the re cache
+_COMPANY_PATTERNS_RE = re.compile(
+    r'\b(inc\.?|corp\.?|corporation|ltd\.?|limited|llc|co\.?)\b'
+    r'|\bpharma\b'
+    r'|\bbiotech\b'
+    r'|\btherapeutics?\b'
+    r'|\bbiosciences?\b'
+    r'|\blife sciences?\b'
+)
+
+# Upper bound on memoized results, so long runs can't grow without limit
+_CACHE_SIZE = 50_000
+
+
+# Affiliations repeat heavily across authors and papers, so results are memoized
+# once per process; the functions only depend on their arguments and the tables above.
+@lru_cache(maxsize=_CACHE_SIZE)
+def _check_affiliation(affiliation: Optional[str],
+                       email: Optional[str]) -> Tuple[bool, Tuple[str, ...]]:
+    """Uncached implementation of CompanyDetector.check_affiliation."""
+    if not affiliation:
+        return (True, ()) if email and _is_company_email(email) else _NOT_COMPANY
+    
+    affiliation_lower = affiliation.lower()
+    company_positions = _COMPANY_MATCHER.find_positions(affiliation_lower)
+    
+    if not _classify(affiliation_lower, len(company_positions), email):
+        return _NOT_COMPANY
+    return True, tuple(_company_names(affiliation, affiliation_lower, company_positions))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _extract_company_names(affiliation: str) -> Tuple[str, ...]:
+    """Uncached implementation of CompanyDetector.extract_company_names."""
+    affiliation_lower = affiliation.lower()
+    positions = _COMPANY_MATCHER.find_positions(affiliation_lower)
+    return tuple(_company_names(affiliation, affiliation_lower, positions))
+
+
+def _classify(affiliation_lower: str, company_score: int, email: Optional[str]) -> bool:
+    """Decide whether a lowercased affiliation with company_score known companies is a company."""
+    # Check email domain first
+    if email and _is_company_email(email):
+        return True
+    
+    # Check if it contains academic indicators (if so, likely not a company)
+    # However, some companies have "research" or "lab" in their names
+    # Only exclude if it's clearly academic
+    academic_score = _ACADEMIC_MATCHER.count(affiliation_lower)
+    if academic_score > company_score:
+        return False
+    
+    # Check for known companies
+    if company_score:
+        return True
+    
+    # Check for company-like patterns
+    return _COMPANY_PATTERNS_RE.search(affiliation_lower) is not None
+
+
+def _is_company_email(email: str) -> bool:
+    """Check if an email address belongs to a known company domain."""
+    _, at, domain = email.rpartition("@")
+    return bool(at) and domain.lower() in COMPANY_EMAIL_DOMAINS
+
+
+def _company_names(affiliation: str, affiliation_lower: str,
+                   positions: Dict[str, int]) -> List[str]:
+    """Turn company keyword positions in the lowercased affiliation into names from the original text."""
+    if not positions:
+        return []
+    
+    if len(affiliation_lower) != len(affiliation):
+        # Lowercasing changed the string length, so offsets must come from the original
+        positions = {
+            company: match.start()
+            for company in positions
+            if (match := re.search(re.escape(company), affiliation, re.IGNORECASE))
+        }
+    
+    # Tokenize once; each match is then mapped to its word by offset
+    words = [(match.start(), match.end(), match.group()) for match in _WORD_RE.finditer(affiliation)]
+    word_starts = [start for start, _, _ in words]
+    
+    companies = []
+    for company, start in positions.items():
+        end = start + len(company)
+        i = bisect_right(word_starts, start) - 1
+        if i >= 0 and end <= words[i][1]:
+            # Take the word containing the match and potentially the next one
+            company_name = words[i][2]
+            if i + 1 < len(words) and any(suffix in words[i + 1][2].lower()
+                                          for suffix in _COMPANY_SUFFIXES):
+                company_name += f" {words[i + 1][2]}"
+        else:
+            # Multi-word company names are taken verbatim from the text
+            company_name = affiliation[start:end]
+        companies.append(company_name)
+    
+    return list(dict.fromkeys(companies))  # Remove duplicates, keeping order
+
 
 class CompanyDetector:
     """Detects pharmaceutical and biotech company affiliations in author information."""
     
+    # The keyword tables, the matchers compiled from them and the memoized
+    # results are module-level and shared by every instance.
+    
+    known_companies = KNOWN_COMPANIES
+    academic_indicators = ACADEMIC_INDICATORS
+    company_email_domains = COMPANY_EMAIL_DOMAINS
+    
     def __init__(self) -> None:
-        """Initialize the company detector with known patterns and companies."""
+        """Initialize the company detector."""
         self.logger = logging.getLogger(__name__)
-        
-        # Known pharmaceutical and biotech companies
-        self.known_companies: Set[str] = {
-            # Major pharmaceutical companies
-            "pfizer", "johnson & johnson", "j&j", "roche", "novartis", "merck", "sanofi",
-            "glaxosmithkline", "gsk", "astrazeneca", "bristol myers squibb", "bms",
-            "abbott", "amgen", "gilead", "biogen", "celgene", "regeneron", "moderna",
-            "biontech", "vertex", "alexion", "incyte", "illumina", "thermo fisher",
-            
-            # Biotech companies
-            "genentech", "immunogen", "seattle genetics", "biomarin", "alkermes",
-            "bluebird bio", "crispr therapeutics", "editas medicine", "intellia",
-            "sangamo", "alnylam", "ionis", "sarepta", "exelixis", "neurocrine",
-            
-            # Generic indicators
-            "pharmaceuticals", "pharmaceutical", "pharma", "biotech", "biotechnology",
-            "therapeutics", "biosciences", "life sciences", "drug discovery"
-        }
-        
-        # Academic institution indicators
-        self.academic_indicators: Set[str] = {
-            "university", "college", "institute", "school", "hospital", "medical center",
-            "research center", "academic", "faculty", "department", "lab", "laboratory"
-        }
-        
-        # Email domain patterns for companies
-        self.company_email_patterns: List[str] = [
-            r"@pfizer\.com", r"@jnj\.com", r"@roche\.com", r"@novartis\.com",
-            r"@merck\.com", r"@sanofi\.com", r"@gsk\.com", r"@astrazeneca\.com",
-            r"@bms\.com", r"@abbott\.com", r"@amgen\.com", r"@gilead\.com",
-            r"@biogen\.com", r"@regeneron\.com", r"@modernatx\.com",
-            r"@biontech\.de", r"@vrtx\.com", r"@thermofisher\.com"
-        ]
     
     def is_company_affiliation(self, affiliation: Optional[str], email: Optional[str] = None) -> bool:
         """
@@ -56,54 +250,33 @@ class CompanyDetector:
         Returns:
             True if the affiliation appears to be a pharmaceutical/biotech company
         """
-        if not affiliation and not email:
-            return False
-        
-        # Check email domain first
-        if email and self._is_company_email(email):
-            return True
-        
-        if not affiliation:
-            return False
+        return self._lookup(affiliation, email)[0]
+    
+    def check_affiliation(self, affiliation: Optional[str],
+                          email: Optional[str] = None) -> Tuple[bool, List[str]]:
+        """
+        Classify an affiliation and extract its company names in a single scan.
         
-        affiliation_lower = affiliation.lower()
+        Equivalent to calling is_company_affiliation and, when it is True,
+        extract_company_names, but lowercases and scans the affiliation only once.
         
-        # Check if it contains academic indicators (if so, likely not a company)
-        if any(indicator in affiliation_lower for indicator in self.academic_indicators):
-            # However, some companies have "research" or "lab" in their names
-            # Only exclude if it's clearly academic
-            academic_score = sum(1 for indicator in self.academic_indicators 
-                                if indicator in affiliation_lower)
-            company_score = sum(1 for company in self.known_companies 
-                               if company in affiliation_lower)
+        Args:
+            affiliation: The affiliation string to check
+            email: Optional email address to check for company domains
             
-            if academic_score > company_score:
-                return False
-        
-        # Check for known companies
-        if any(company in affiliation_lower for company in self.known_companies):
-            return True
-        
-        # Check for company-like patterns
-        company_patterns = [
-            r'\b(inc\.?|corp\.?|corporation|ltd\.?|limited|llc|co\.?)\b',
-            r'\bpharma\b',
-            r'\bbiotech\b',
-            r'\btherapeutics?\b',
-            r'\bbiosciences?\b',
-            r'\blife sciences?\b'
-        ]
-        
-        for pattern in company_patterns:
-            if re.search(pattern, affiliation_lower):
-                return True
-        
-        return False
+        Returns:
+            Tuple of (is company affiliation, company names); the names are only
+            extracted for company affiliations
+        """
+        is_company, companies = self._lookup(affiliation, email)
+        return is_company, list(companies)
     
-    def _is_company_email(self, email: str) -> bool:
-        """Check if an email address belongs to a known company domain."""
-        email_lower = email.lower()
-        return any(re.search(pattern, email_lower) for pattern in self.company_email_patterns)
+    def _lookup(self, affiliation: Optional[str],
+                email: Optional[str]) -> Tuple[bool, Tuple[str, ...]]:
+        """Return the memoized check_affiliation result without copying it."""
+        if not affiliation and not email:
+            return _NOT_COMPANY
+        return _check_affiliation(affiliation, email)
     
     def extract_company_names(self, affiliation: Optional[str]) -> List[str]:
         """
@@ -117,31 +290,8 @@ class CompanyDetector:
         """
         if not affiliation:
             return []
-        
-        companies = []
-        affiliation_lower = affiliation.lower()
-        
-        # Look for known companies
-        for company in self.known_companies:
-            if company in affiliation_lower:
-                # Try to extract the full company name from the original text
-                pattern = re.compile(re.escape(company), re.IGNORECASE)
-                match = pattern.search(affiliation)
-                if match:
-                    # Try to get more context around the match
-                    start, end = match.span()
-                    # Look for word boundaries to get full company name
-                    words = affiliation.split()
-                    for i, word in enumerate(words):
-                        if company.lower() in word.lower():
-                            # Take this word and potentially adjacent ones
-                            company_name = word
-                            if i + 1 < len(words) and any(suffix in words[i + 1].lower() 
-                                                        for suffix in ['inc', 'corp', 'ltd', 'llc']):
-                                company_name += f" {words[i + 1]}"
-                            companies.append(company_name)
-                            break
-                    else:
-                        companies.append(match.group())
-        
-        return list(set(companies))  # Remove duplicates
\ No newline at end of file
+        return list(_extract_company_names(affiliation))
+
+
+# Shared instance for callers that have no reason to build their own
+DEFAULT_DETECTOR = CompanyDetector()
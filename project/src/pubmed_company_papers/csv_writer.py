@@ -1,45 +1,118 @@
 """CSV output utilities for paper results."""
 
 import csv
-from typing import List, TextIO
+import io
+from typing import IO, Iterable, Iterator, List, Optional, Protocol, TextIO, Tuple, Union, cast
 from datetime import datetime
 
 from .models import PaperResult
 
 
+_FIELDNAMES = (
+    "PubmedID",
+    "Title",
+    "Publication Date",
+    "Non-academic Author(s)",
+    "Company Affiliation(s)",
+    "Corresponding Author Email"
+)
+
+# The header never changes and none of its fields need quoting, so it is joined once
+_HEADER_LINE = ",".join(_FIELDNAMES)
+
+
+def _fmt_date(date: Optional[datetime]) -> str:
+    """Format a date as YYYY-MM-DD without going through locale-aware strftime."""
+    if date is None:
+        return ""
+    return f"{date.year:04d}-{date.month:02d}-{date.day:02d}"
+
+
+class _Writable(Protocol):
+    """Anything csv.writer can write to."""
+    
+    def write(self, s: str) -> object: ...
+
+
+class _ChunkSink:
+    """Minimal file-like target collecting written chunks for a single join."""
+    
+    def __init__(self) -> None:
+        self.chunks: List[str] = []
+        self.write = self.chunks.append
+
+
+class _Utf8Sink:
+    """File-like target encoding each written chunk to UTF-8 for a binary file."""
+    
+    def __init__(self, output: IO[bytes]) -> None:
+        self._output = output
+    
+    def write(self, s: str) -> object:
+        return self._output.write(s.encode("utf-8"))
+
+
+def _is_binary(output_file: Union[TextIO, IO[bytes]]) -> bool:
+    """Tell whether a file object expects bytes rather than str."""
+    if isinstance(output_file, (io.RawIOBase, io.BufferedIOBase)):
+        return True
+    if isinstance(output_file, io.TextIOBase):
+        return False
+    # File-likes outside the io hierarchy (e.g. SpooledTemporaryFile on 3.10)
+    return "b" in getattr(output_file, "mode", "")
+
+
 class CSVWriter:
     """Writes paper results to CSV format."""
     
     @staticmethod
-    def write_results(papers: List[PaperResult], output_file: TextIO) -> None:
+    def _rows(papers: Iterable[PaperResult]) -> Iterator[Tuple[str, ...]]:
+        """Yield one CSV row tuple per paper, in _FIELDNAMES order."""
+        for paper in papers:
+            yield (
+                paper.pubmed_id,
+                paper.title,
+                _fmt_date(paper.publication_date),
+                "; ".join(paper.non_academic_authors),
+                "; ".join(paper.company_affiliations),
+                paper.corresponding_author_email or ""
+            )
+    
+    @staticmethod
+    def _write(papers: Iterable[PaperResult], output: _Writable, lineterminator: str = "\r\n") -> None:
+        """Write the header and all rows, letting the C csv writer drain the row generator."""
+        output.write(_HEADER_LINE + lineterminator)
+        writer = csv.writer(output, lineterminator=lineterminator)
+        writer.writerows(CSVWriter._rows(papers))
+    
+    @staticmethod
+    def write_results(papers: List[PaperResult], output_file: Union[TextIO, IO[bytes]],
+                      lineterminator: str = "\r\n") -> int:
         """
         Write paper results to CSV file.
         
+        Binary files (io binary streams or any file whose mode contains "b") are
+        written as UTF-8; the caller's file is left open.
+        
         Args:
             papers: List of paper results to write
-            output_file: File object to write to
+            output_file: Text or binary file object to write to
+            lineterminator: Row terminator; use "\n" for streams that translate newlines
+            
+        Returns:
+            Number of data rows written, not counting the header
         """
-        fieldnames = [
-            "PubmedID",
-            "Title", 
-            "Publication Date",
-            "Non-academic Author(s)",
-            "Company Affiliation(s)",
-            "Corresponding Author Email"
-        ]
-        
-        writer = csv.DictWriter(output_file, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for paper in papers:
-            writer.writerow({
-                "PubmedID": paper.pubmed_id,
-                "Title": paper.title,
-                "Publication Date": paper.publication_date.strftime('%Y-%m-%d') if paper.publication_date else "",
-                "Non-academic Author(s)": "; ".join(paper.non_academic_authors),
-                "Company Affiliation(s)": "; ".join(paper.company_affiliations),
-                "Corresponding Author Email": paper.corresponding_author_email or ""
-            })
+        if not _is_binary(output_file):
+            CSVWriter._write(papers, cast(TextIO, output_file), lineterminator)
+        elif isinstance(output_file, io.IOBase):
+            text_file = io.TextIOWrapper(cast(IO[bytes], output_file), encoding="utf-8", newline="")
+            try:
+                CSVWriter._write(papers, text_file, lineterminator)
+            finally:
+                text_file.detach()
+        else:
+            CSVWriter._write(papers, _Utf8Sink(cast(IO[bytes], output_file)), lineterminator)
+        return len(papers)
     
     @staticmethod
     def format_results_string(papers: List[PaperResult]) -> str:
@@ -52,11 +125,7 @@ class CSVWriter:
         Returns:
             CSV-formatted string
         """
-        import io
-        
-        output = io.StringIO()
-        CSVWriter.write_results(papers, output)
-        result = output.getvalue()
-        output.close()
+        sink = _ChunkSink()
+        CSVWriter._write(papers, sink)
         
-        return result
\ No newline at end of file
+        return "".join(sink.chunks)
@@ -1,16 +1,47 @@
 """PubMed API fetcher for research papers."""
 
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any
 import logging
+import threading
 import time
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from email_validator import validate_email, EmailNotValidError
 
 from .models import PaperResult, AuthorInfo
-from .company_detector import CompanyDetector
+from .company_detector import DEFAULT_DETECTOR
+
+
+logger = logging.getLogger(__name__)
+
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+# Like expat, never expand external entities or fetch anything over the network
+# while parsing E-utilities responses
+_PARSER_OPTIONS: Dict[str, Any] = {"resolve_entities": False, "no_network": True}
+_XML_PARSER = etree.XMLParser(**_PARSER_OPTIONS)
+
+# XPath expressions compiled once and reused for every article. smart_strings is
+# off so string results don't keep a reference back into the (cleared) tree.
+_XP_PMID = etree.XPath("string(.//PMID)", smart_strings=False)
+_XP_TITLE = etree.XPath("string(.//ArticleTitle)", smart_strings=False)
+_XP_AUTHORS = etree.XPath("(.//AuthorList)[1]/Author")
+_XP_AFFILIATION = etree.XPath("string(.//AffiliationInfo/Affiliation)", smart_strings=False)
+_XP_DATES = tuple(
+    etree.XPath(f"({path})[1]")
+    for path in (
+        ".//PubDate",
+        ".//ArticleDate[@DateType='Electronic']",
+        ".//DateCompleted",
+        ".//DateRevised"
+    )
+)
 
 
 class PubMedAPIError(Exception):
@@ -18,30 +49,65 @@ class PubMedAPIError(Exception):
     pass
 
 
+class _RateLimiter:
+    """Thread-safe limiter that spaces requests at least `interval` seconds apart."""
+    
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self) -> None:
+        """Block until the caller may issue its next request."""
+        with self._lock:
+            slot = max(time.monotonic(), self._next_slot)
+            self._next_slot = slot + self.interval
+        
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
 class PubMedFetcher:
     """Fetches research papers from PubMed API and identifies company affiliations."""
     
-    def __init__(self, email: str = "user@example.com", debug: bool = False) -> None:
+    def __init__(self, email: str = "user@example.com", debug: bool = False,
+                 api_key: Optional[str] = None) -> None:
         """
         Initialize the PubMed fetcher.
         
         Args:
             email: Email address for PubMed API requests (required for large queries)
-            debug: Enable debug logging
+            debug: Ignored; kept for compatibility. Configure the
+                "pubmed_company_papers" logger in the application instead
+            api_key: Optional NCBI API key, which raises the rate limit to 10 requests/second
         """
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
         self.email = email
-        self.company_detector = CompanyDetector()
-        
-        # Set up logging
-        logging.basicConfig(
-            level=logging.DEBUG if debug else logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        self.logger = logging.getLogger(__name__)
-        
-        # API rate limiting
-        self.request_delay = 0.34  # ~3 requests per second as recommended by NCBI
+        self.api_key = api_key
+        self.company_detector = DEFAULT_DETECTOR
+        
+        # Logging handlers, format and level are configured by the application
+        # (see cli.py); the shared module logger is never changed per instance
+        self.logger = logger
+        
+        # API rate limiting: ~3 requests per second as recommended by NCBI,
+        # or 10 per second with an API key. Both keep a small margin under the
+        # ceiling, since urllib3 retries are resent without going through the limiter.
+        self.request_delay = 0.11 if api_key else 0.34
+        self._rate_limiter = _RateLimiter(self.request_delay)
+        
+        # Number of efetch batches downloaded concurrently
+        self.max_workers = 3
+        
+        # One keep-alive session for all calls, retrying transient failures
+        self._session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                                    max_retries=retries))
+        
+        # Size of the network reads fed to the incremental XML parser
+        self.stream_chunk_size = 64 * 1024
     
     def search_papers(self, query: str, max_results: int = 100) -> List[str]:
         """
@@ -57,37 +123,34 @@ class PubMedFetcher:
         Raises:
             PubMedAPIError: If the API request fails
         """
-        self.logger.info(f"Searching PubMed with query: {query}")
+        self.logger.info("Searching PubMed with query: %s", query)
         
         search_url = f"{self.base_url}/esearch.fcgi"
-        params = {
+        params = self._api_params({
             "db": "pubmed",
             "term": query,
             "retmax": max_results,
-            "retmode": "xml",
-            "email": self.email,
-            "tool": "pubmed_company_papers"
-        }
+            "retmode": "xml"
+        })
         
+        self._rate_limiter.wait()
         try:
-            response = requests.get(search_url, params=params, timeout=30)
+            response = self._session.get(search_url, params=params, timeout=30)
             response.raise_for_status()
         except requests.RequestException as e:
             raise PubMedAPIError(f"Failed to search PubMed: {e}")
         
-        time.sleep(self.request_delay)
-        
         try:
-            root = ET.fromstring(response.content)
+            root = etree.fromstring(response.content, _XML_PARSER)
             id_list = root.find(".//IdList")
             if id_list is None:
                 return []
             
             pmids = [id_elem.text for id_elem in id_list.findall("Id") if id_elem.text]
-            self.logger.info(f"Found {len(pmids)} papers")
+            self.logger.info("Found %d papers", len(pmids))
             return pmids
             
-        except ET.ParseError as e:
+        except etree.XMLSyntaxError as e:
             raise PubMedAPIError(f"Failed to parse search results: {e}")
     
     def fetch_paper_details(self, pmids: List[str]) -> List[PaperResult]:
@@ -106,71 +169,102 @@ class PubMedFetcher:
         if not pmids:
             return []
         
-        self.logger.info(f"Fetching details for {len(pmids)} papers")
+        self.logger.info("Fetching details for %d papers", len(pmids))
         
         # Process in batches to avoid URL length limits
         batch_size = 200
-        all_results = []
+        batches = [pmids[i:i + batch_size] for i in range(0, len(pmids), batch_size)]
         
-        for i in range(0, len(pmids), batch_size):
-            batch = pmids[i:i + batch_size]
-            results = self._fetch_batch_details(batch)
-            all_results.extend(results)
-            
-            if i + batch_size < len(pmids):
-                time.sleep(self.request_delay)
+        if len(batches) == 1:
+            return self._fetch_batch_details(batches[0])
+        
+        # Downloads are I/O bound, so overlap them; the shared rate limiter
+        # keeps the combined request rate within NCBI's limits
+        all_results = []
+        workers = min(self.max_workers, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._fetch_batch_details, batch) for batch in batches]
+            try:
+                # Collect in submission order so results keep the search ranking
+                for future in futures:
+                    all_results.extend(future.result())
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
         
         return all_results
     
     def _fetch_batch_details(self, pmids: List[str]) -> List[PaperResult]:
         """Fetch details for a batch of PubMed IDs."""
         fetch_url = f"{self.base_url}/efetch.fcgi"
-        params = {
+        params = self._api_params({
             "db": "pubmed",
             "id": ",".join(pmids),
-            "retmode": "xml",
-            "email": self.email,
-            "tool": "pubmed_company_papers"
-        }
+            "retmode": "xml"
+        })
         
+        self._rate_limiter.wait()
         try:
-            response = requests.get(fetch_url, params=params, timeout=60)
-            response.raise_for_status()
+            with self._session.get(fetch_url, params=params, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                return self._parse_paper_details(
+                    response.iter_content(chunk_size=self.stream_chunk_size)
+                )
         except requests.RequestException as e:
             raise PubMedAPIError(f"Failed to fetch paper details: {e}")
-        
-        try:
-            root = ET.fromstring(response.content)
-            return self._parse_paper_details(root)
-        except ET.ParseError as e:
+        except etree.XMLSyntaxError as e:
             raise PubMedAPIError(f"Failed to parse paper details: {e}")
     
-    def _parse_paper_details(self, root: ET.Element) -> List[PaperResult]:
-        """Parse paper details from XML response."""
-        results = []
+    def _api_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the identification parameters NCBI expects on every E-utilities call."""
+        params["email"] = self.email
+        params["tool"] = "pubmed_company_papers"
+        if self.api_key:
+            params["api_key"] = self.api_key
+        return params
+    
+    def _parse_paper_details(self, chunks: Iterable[bytes]) -> List[PaperResult]:
+        """
+        Parse paper details from a streamed XML response.
         
-        for article in root.findall(".//PubmedArticle"):
-            try:
-                result = self._parse_single_paper(article)
-                if result:
-                    results.append(result)
-            except Exception as e:
-                self.logger.warning(f"Failed to parse paper: {e}")
-                continue
+        Each PubmedArticle is parsed as soon as its closing tag arrives and is
+        then dropped from the tree, so memory stays bounded by a single article
+        rather than the whole batch.
+        """
+        results = []
+        parser = etree.XMLPullParser(events=("end",), tag="PubmedArticle", **_PARSER_OPTIONS)
         
+        for chunk in chunks:
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                try:
+                    result = self._parse_single_paper(elem)
+                    if result:
+                        results.append(result)
+                except Exception as e:
+                    self.logger.warning("Failed to parse paper: %s", e)
+                
+                # Release the finished article and the siblings already parsed
+                # before it; articles still being built after it are untouched
+                elem.clear()
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+        
+        parser.close()
         return results
     
-    def _parse_single_paper(self, article: ET.Element) -> Optional[PaperResult]:
+    def _parse_single_paper(self, article: etree._Element) -> Optional[PaperResult]:
         """Parse a single paper from XML."""
         # Get PubMed ID
-        pmid_elem = article.find(".//PMID")
-        if pmid_elem is None or pmid_elem.text is None:
+        pmid = _XP_PMID(article)
+        if not pmid:
             return None
-        pmid = pmid_elem.text
         
         # Get title
-        title_elem = article.find(".//ArticleTitle")
-        title = title_elem.text if title_elem is not None and title_elem.text else "No title"
+        title = _XP_TITLE(article) or "No title"
         
         # Get publication date
         pub_date = self._extract_publication_date(article)
@@ -179,21 +273,24 @@ class PubMedFetcher:
         authors = self._extract_authors(article)
         
         # Filter for papers with company affiliations
-        non_academic_authors = []
-        company_affiliations = []
+        non_academic_authors: List[str] = []
+        company_affiliations: List[str] = []
         corresponding_author_email = None
         
         has_company_author = False
         
         for author in authors:
-            if self.company_detector.is_company_affiliation(author.affiliation, author.email):
+            is_company, companies = self.company_detector.check_affiliation(
+                author.affiliation, author.email
+            )
+            if is_company:
                 author.is_non_academic = True
                 has_company_author = True
+                # Authors and company names recur across many papers; intern them
+                # so every result holds the same string objects
+                author.name = sys.intern(author.name)
                 non_academic_authors.append(author.name)
-                
-                # Extract company names
-                companies = self.company_detector.extract_company_names(author.affiliation)
-                company_affiliations.extend(companies)
+                company_affiliations.extend(map(sys.intern, companies))
             
             if author.is_corresponding and author.email:
                 corresponding_author_email = author.email
@@ -207,24 +304,16 @@ class PubMedFetcher:
             title=title,
             publication_date=pub_date,
             authors=authors,
-            non_academic_authors=list(set(non_academic_authors)),
-            company_affiliations=list(set(company_affiliations)),
+            non_academic_authors=list(dict.fromkeys(non_academic_authors)),
+            company_affiliations=list(dict.fromkeys(company_affiliations)),
             corresponding_author_email=corresponding_author_email
         )
     
-    def _extract_publication_date(self, article: ET.Element) -> Optional[datetime]:
+    def _extract_publication_date(self, article: etree._Element) -> Optional[datetime]:
         """Extract publication date from article XML."""
         # Try different date elements
-        date_elements = [
-            ".//PubDate",
-            ".//ArticleDate[@DateType='Electronic']",
-            ".//DateCompleted",
-            ".//DateRevised"
-        ]
-        
-        for date_path in date_elements:
-            date_elem = article.find(date_path)
-            if date_elem is not None:
+        for date_xpath in _XP_DATES:
+            for date_elem in date_xpath(article):
                 year_elem = date_elem.find("Year")
                 month_elem = date_elem.find("Month")
                 day_elem = date_elem.find("Day")
@@ -240,15 +329,11 @@ class PubMedFetcher:
         
         return None
     
-    def _extract_authors(self, article: ET.Element) -> List[AuthorInfo]:
+    def _extract_authors(self, article: etree._Element) -> List[AuthorInfo]:
         """Extract author information from article XML."""
         authors = []
         
-        author_list = article.find(".//AuthorList")
-        if author_list is None:
-            return authors
-        
-        for author_elem in author_list.findall("Author"):
+        for author_elem in _XP_AUTHORS(article):
             name = self._extract_author_name(author_elem)
             if not name:
                 continue
@@ -271,7 +356,7 @@ class PubMedFetcher:
         
         return authors
     
-    def _extract_author_name(self, author_elem: ET.Element) -> Optional[str]:
+    def _extract_author_name(self, author_elem: etree._Element) -> Optional[str]:
         """Extract author name from author element."""
         last_name = author_elem.find("LastName")
         first_name = author_elem.find("ForeName")
@@ -290,18 +375,16 @@ class PubMedFetcher:
         # Try collective name
         collective_name = author_elem.find("CollectiveName")
         if collective_name is not None and collective_name.text:
-            return collective_name.text
+            return str(collective_name.text)
         
         return None
     
-    def _extract_affiliation(self, author_elem: ET.Element) -> Optional[str]:
+    def _extract_affiliation(self, author_elem: etree._Element) -> Optional[str]:
         """Extract affiliation from author element."""
-        affiliation_info = author_elem.find(".//AffiliationInfo/Affiliation")
-        if affiliation_info is not None and affiliation_info.text:
-            return affiliation_info.text.strip()
-        return None
+        affiliation: str = _XP_AFFILIATION(author_elem)
+        return affiliation.strip() or None
     
-    def _is_corresponding_author(self, author_elem: ET.Element) -> bool:
+    def _is_corresponding_author(self, author_elem: etree._Element) -> bool:
         """Check if author is corresponding author."""
         # This is a heuristic - PubMed doesn't always mark corresponding authors clearly
         affiliation = self._extract_affiliation(author_elem)
@@ -309,16 +392,17 @@ class PubMedFetcher:
             return True
         return False
     
-    def _extract_email(self, author_elem: ET.Element, article: ET.Element) -> Optional[str]:
+    def _extract_email(self, author_elem: etree._Element, article: etree._Element) -> Optional[str]:
         """Extract email address from author or article information."""
         # Look for email in affiliation
         affiliation = self._extract_affiliation(author_elem)
         if affiliation:
-            email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', affiliation)
+            email_match = _EMAIL_RE.search(affiliation)
             if email_match:
                 email = email_match.group()
                 try:
-                    validate_email(email)
+                    # Syntax only; a DNS deliverability lookup per author is far too slow
+                    validate_email(email, check_deliverability=False)
                     return email
                 except EmailNotValidError:
                     pass
@@ -342,6 +426,6 @@ class PubMedFetcher:
             return []
         
         papers = self.fetch_paper_details(pmids)
-        self.logger.info(f"Found {len(papers)} papers with company affiliations")
+        self.logger.info("Found %d papers with company affiliations", len(papers))
         
         return papers
\ No newline at end of file
@@ -1,11 +1,11 @@
 """Data models for PubMed paper fetcher."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class AuthorInfo:
     """Information about a paper author."""
     
@@ -16,23 +16,14 @@ class AuthorInfo:
     is_non_academic: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class PaperResult:
     """Result data for a research paper."""
     
     pubmed_id: str
     title: str
     publication_date: Optional[datetime] = None
-    authors: List[AuthorInfo] = None
-    non_academic_authors: List[str] = None
-    company_affiliations: List[str] = None
-    corresponding_author_email: Optional[str] = None
-    
-    def __post_init__(self) -> None:
-        """Initialize default values for mutable fields."""
-        if self.authors is None:
-            self.authors = []
-        if self.non_academic_authors is None:
-            self.non_academic_authors = []
-        if self.company_affiliations is None:
-            self.company_affiliations = []
\ No newline at end of file
+    authors: List[AuthorInfo] = field(default_factory=list)
+    non_academic_authors: List[str] = field(default_factory=list)
+    company_affiliations: List[str] = field(default_factory=list)
+    corresponding_author_email: Optional[str] = None
\ No newline at end of file
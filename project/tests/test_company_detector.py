@@ -1,15 +1,15 @@
 """Tests for company detection functionality."""
 
 import pytest
-from pubmed_company_papers.company_detector import CompanyDetector
+from typing import Iterator
+from pubmed_company_papers import company_detector
+from pubmed_company_papers.company_detector import CompanyDetector, _KeywordMatcher
 
 
-class TestCompanyDetector:
-    """Test cases for CompanyDetector class."""
+class _DetectorBehaviourTests:
+    """Detector tests that depend on the keyword matcher backend."""
     
-    def setup_method(self) -> None:
-        """Set up test fixtures."""
-        self.detector = CompanyDetector()
+    detector: CompanyDetector
     
     def test_known_pharmaceutical_company(self) -> None:
         """Test detection of known pharmaceutical companies."""
@@ -48,19 +48,6 @@ class TestCompanyDetector:
         for affiliation in affiliations:
             assert not self.detector.is_company_affiliation(affiliation), f"Incorrectly detected: {affiliation}"
     
-    def test_company_email_domains(self) -> None:
-        """Test detection based on company email domains."""
-        test_cases = [
-            ("Any Affiliation", "researcher@pfizer.com", True),
-            ("Any Affiliation", "scientist@jnj.com", True),
-            ("Any Affiliation", "user@gmail.com", False),
-            ("Any Affiliation", "researcher@university.edu", False)
-        ]
-        
-        for affiliation, email, expected in test_cases:
-            result = self.detector.is_company_affiliation(affiliation, email)
-            assert result == expected, f"Failed for {affiliation}, {email}: expected {expected}, got {result}"
-    
     def test_generic_company_patterns(self) -> None:
         """Test detection of generic company patterns."""
         affiliations = [
@@ -74,6 +61,59 @@ class TestCompanyDetector:
         for affiliation in affiliations:
             assert self.detector.is_company_affiliation(affiliation), f"Failed to detect: {affiliation}"
     
+    def test_extract_company_names(self) -> None:
+        """Test extraction of company names from affiliations."""
+        test_cases = [
+            ("Pfizer Inc., New York, NY", ["Pfizer"]),
+            ("Novartis Pharmaceuticals, Basel, Switzerland", ["Novartis", "Pharmaceuticals"]),
+            ("Johnson & Johnson Research, New Brunswick, NJ", ["Johnson & Johnson"]),
+            ("No company here", [])
+        ]
+        
+        for affiliation, expected_companies in test_cases:
+            companies = self.detector.extract_company_names(affiliation)
+            # Check that at least one expected company is found
+            if expected_companies:
+                assert any(expected in ' '.join(companies).lower() for expected in [c.lower() for c in expected_companies]), \
+                    f"Expected companies {expected_companies} not found in {companies} for {affiliation}"
+            else:
+                assert not companies, f"Unexpected companies found: {companies} for {affiliation}"
+    
+    def test_extract_company_names_order(self) -> None:
+        """Test that extracted company names follow their order in the affiliation."""
+        companies = self.detector.extract_company_names("Genentech and Roche Diagnostics")
+        assert companies == ["Genentech", "Roche"]
+    
+    def test_check_affiliation(self) -> None:
+        """Test combined classification and extraction."""
+        assert self.detector.check_affiliation("Pfizer Inc., New York, NY") == (True, ["Pfizer Inc.,"])
+        assert self.detector.check_affiliation("Harvard University, Boston, MA") == (False, [])
+        assert self.detector.check_affiliation(None, "researcher@pfizer.com") == (True, [])
+        assert self.detector.check_affiliation(None) == (False, [])
+
+
+class TestCompanyDetector(_DetectorBehaviourTests):
+    """Test cases for CompanyDetector class."""
+    
+    def setup_method(self) -> None:
+        """Set up test fixtures."""
+        self.detector = CompanyDetector()
+    
+    def test_company_email_domains(self) -> None:
+        """Test detection based on company email domains."""
+        test_cases = [
+            ("Any Affiliation", "researcher@pfizer.com", True),
+            ("Any Affiliation", "scientist@jnj.com", True),
+            ("Any Affiliation", "user@gmail.com", False),
+            ("Any Affiliation", "researcher@university.edu", False),
+            ("Any Affiliation", "Researcher@Pfizer.COM", True),
+            ("Any Affiliation", "pfizer.com", False)
+        ]
+        
+        for affiliation, email, expected in test_cases:
+            result = self.detector.is_company_affiliation(affiliation, email)
+            assert result == expected, f"Failed for {affiliation}, {email}: expected {expected}, got {result}"
+    
     def test_mixed_affiliations(self) -> None:
         """Test affiliations that contain both academic and company indicators."""
         # These should be detected as companies due to strong company indicators
@@ -94,23 +134,21 @@ class TestCompanyDetector:
         for affiliation in academic_affiliations:
             assert not self.detector.is_company_affiliation(affiliation), f"Incorrectly detected: {affiliation}"
     
-    def test_extract_company_names(self) -> None:
-        """Test extraction of company names from affiliations."""
-        test_cases = [
-            ("Pfizer Inc., New York, NY", ["Pfizer"]),
-            ("Novartis Pharmaceuticals, Basel, Switzerland", ["Novartis", "Pharmaceuticals"]),
-            ("Johnson & Johnson Research, New Brunswick, NJ", ["Johnson & Johnson"]),
-            ("No company here", [])
-        ]
+    def test_repeated_affiliations_are_cached(self) -> None:
+        """Test that repeated lookups are stable and callers cannot corrupt the cache."""
+        affiliation = "Pfizer Inc., New York, NY"
         
-        for affiliation, expected_companies in test_cases:
-            companies = self.detector.extract_company_names(affiliation)
-            # Check that at least one expected company is found
-            if expected_companies:
-                assert any(expected in ' '.join(companies).lower() for expected in [c.lower() for c in expected_companies]), \
-                    f"Expected companies {expected_companies} not found in {companies} for {affiliation}"
-            else:
-                assert not companies, f"Unexpected companies found: {companies} for {affiliation}"
+        assert self.detector.is_company_affiliation(affiliation)
+        assert self.detector.is_company_affiliation(affiliation)
+        
+        companies = self.detector.extract_company_names(affiliation)
+        companies.append("Mutated")
+        assert self.detector.extract_company_names(affiliation) == companies[:-1]
+    
+    def test_cache_is_bounded(self) -> None:
+        """Test that the shared memo caches have a size limit."""
+        for cached in (company_detector._check_affiliation, company_detector._extract_company_names):
+            assert cached.cache_info().maxsize == company_detector._CACHE_SIZE == 50_000
     
     def test_empty_or_none_input(self) -> None:
         """Test handling of empty or None inputs."""
@@ -118,4 +156,74 @@ class TestCompanyDetector:
         assert not self.detector.is_company_affiliation("")
         assert not self.detector.is_company_affiliation("", "")
         assert self.detector.extract_company_names(None) == []
-        assert self.detector.extract_company_names("") == []
\ No newline at end of file
+        assert self.detector.extract_company_names("") == []
+
+
+class TestKeywordMatcher:
+    """Test cases for the _KeywordMatcher backends."""
+    
+    def test_rejects_short_text(self) -> None:
+        """Test that text shorter than every keyword is rejected without matching."""
+        matcher = _KeywordMatcher(["pfizer", "gsk"])
+        assert matcher.find_positions("gs") == {}
+        assert matcher.find_positions("gsk") == {"gsk": 0}
+        assert matcher.count("gs") == 0
+    
+    def test_counts_distinct_keywords(self) -> None:
+        """Test that repeated and nested keywords are each counted once."""
+        matcher = _KeywordMatcher(CompanyDetector.academic_indicators)
+        text = "university laboratory, department of medicine, university lab"
+        
+        assert matcher.count(text) == len(matcher.find_positions(text)) == 4
+    
+    def test_automaton_requires_pyahocorasick(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that forcing the automaton without pyahocorasick fails clearly."""
+        monkeypatch.setattr("pubmed_company_papers.company_detector.ahocorasick", None)
+        
+        with pytest.raises(ImportError, match="pyahocorasick"):
+            _KeywordMatcher(["pfizer"], use_automaton=True)
+        assert _KeywordMatcher(["pfizer"]).find_positions("pfizer inc.") == {"pfizer": 0}
+    
+    def test_regex_fallback_matches_automaton(self) -> None:
+        """Test that the stdlib fallback finds the same keywords as Aho-Corasick."""
+        pytest.importorskip("ahocorasick")
+        keywords = CompanyDetector.known_companies | CompanyDetector.academic_indicators
+        automaton_matcher = _KeywordMatcher(keywords, use_automaton=True)
+        regex_matcher = _KeywordMatcher(keywords, use_automaton=False)
+        
+        texts = [
+            "novartis pharmaceuticals, basel, switzerland",
+            "university hospital pharmaceutical department",
+            "bristol myers squibb (bms) research laboratory",
+            "crispr therapeutics and editas medicine biotechnology lab",
+            "no keywords here"
+        ]
+        for text in texts:
+            # Same keywords, offsets and order from both backends
+            assert (list(regex_matcher.find_positions(text).items())
+                    == list(automaton_matcher.find_positions(text).items())), text
+
+
+class TestCompanyDetectorRegexFallback(_DetectorBehaviourTests):
+    """Run the detector tests against the stdlib regex keyword matcher."""
+    
+    @pytest.fixture(autouse=True)
+    def regex_backend(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+        """Swap the module matchers for the regex backend with empty caches."""
+        monkeypatch.setattr(company_detector, "_COMPANY_MATCHER",
+                            _KeywordMatcher(CompanyDetector.known_companies, use_automaton=False))
+        monkeypatch.setattr(company_detector, "_ACADEMIC_MATCHER",
+                            _KeywordMatcher(CompanyDetector.academic_indicators, use_automaton=False))
+        self._clear_caches()
+        yield
+        # Don't leave regex-backend results behind for other tests
+        self._clear_caches()
+    
+    @staticmethod
+    def _clear_caches() -> None:
+        company_detector._check_affiliation.cache_clear()
+        company_detector._extract_company_names.cache_clear()
+    
+    def setup_method(self) -> None:
+        """Set up a detector; the fixture above selects its backend."""
+        self.detector = CompanyDetector()
@@ -2,6 +2,7 @@
 
 import pytest
 import io
+import tempfile
 from datetime import datetime
 from pubmed_company_papers.csv_writer import CSVWriter
 from pubmed_company_papers.models import PaperResult, AuthorInfo
@@ -13,7 +14,7 @@ class TestCSVWriter:
     def test_write_empty_results(self) -> None:
         """Test writing empty results."""
         output = io.StringIO()
-        CSVWriter.write_results([], output)
+        assert CSVWriter.write_results([], output) == 0
         
         result = output.getvalue()
         lines = result.strip().split('\n')
@@ -23,6 +24,16 @@ class TestCSVWriter:
         assert "PubmedID" in lines[0]
         assert "Title" in lines[0]
     
+    def test_header_line(self) -> None:
+        """Test that the header row matches the documented columns exactly."""
+        output = io.StringIO()
+        CSVWriter.write_results([], output)
+        
+        assert output.getvalue() == (
+            "PubmedID,Title,Publication Date,Non-academic Author(s),"
+            "Company Affiliation(s),Corresponding Author Email\r\n"
+        )
+    
     def test_write_single_result(self) -> None:
         """Test writing a single paper result."""
         paper = PaperResult(
@@ -74,7 +85,7 @@ class TestCSVWriter:
         ]
         
         output = io.StringIO()
-        CSVWriter.write_results(papers, output)
+        assert CSVWriter.write_results(papers, output) == 2
         
         result = output.getvalue()
         lines = result.strip().split('\n')
@@ -103,6 +114,40 @@ class TestCSVWriter:
         assert "Test Paper" in result
         assert "2023-06-15" in result
     
+    def test_date_formatting(self) -> None:
+        """Test that dates are zero-padded as YYYY-MM-DD."""
+        paper = PaperResult(pubmed_id="1", title="T", publication_date=datetime(987, 1, 5))
+        
+        result = CSVWriter.format_results_string([paper])
+        
+        assert "0987-01-05" in result
+    
+    def test_custom_lineterminator(self) -> None:
+        """Test writing rows with a custom line terminator."""
+        output = io.StringIO()
+        CSVWriter.write_results([PaperResult(pubmed_id="1", title="T")], output, lineterminator="\n")
+        
+        assert "\r" not in output.getvalue()
+        assert output.getvalue().count("\n") == 2
+    
+    def test_write_binary_file(self) -> None:
+        """Test that binary files receive UTF-8 CSV and are left open."""
+        paper = PaperResult(pubmed_id="1", title="Étude, première partie")
+        output = io.BytesIO()
+        assert CSVWriter.write_results([paper], output) == 1
+        
+        assert not output.closed
+        assert output.getvalue().decode("utf-8") == CSVWriter.format_results_string([paper])
+    
+    def test_write_spooled_binary_file(self) -> None:
+        """Test that binary file-likes detected by their mode are written as UTF-8."""
+        paper = PaperResult(pubmed_id="1", title="Étude, première partie")
+        with tempfile.SpooledTemporaryFile(mode="w+b") as output:
+            assert CSVWriter.write_results([paper], output) == 1
+            
+            output.seek(0)
+            assert output.read().decode("utf-8") == CSVWriter.format_results_string([paper])
+    
     def test_handle_missing_data(self) -> None:
         """Test handling of missing/None data."""
         paper = PaperResult(
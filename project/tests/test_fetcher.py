@@ -0,0 +1,206 @@
+"""Tests for PubMed fetcher XML parsing."""
+
+import pytest
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+from pubmed_company_papers.company_detector import DEFAULT_DETECTOR
+from pubmed_company_papers.fetcher import PubMedFetcher, _RateLimiter
+from pubmed_company_papers.models import PaperResult
+
+
+class _FakeResponse:
+    """Stand-in for requests.Response serving a fixed body."""
+    
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+    
+    def raise_for_status(self) -> None:
+        pass
+    
+    def iter_content(self, chunk_size: int) -> List[bytes]:
+        return [self.content]
+
+
+def _external_entity_doc(body: bytes, secret_file: Path) -> bytes:
+    """Wrap body in a document declaring &e; as an external SYSTEM entity."""
+    return (
+        b'<?xml version="1.0" ?>\n'
+        b'<!DOCTYPE doc [<!ENTITY e SYSTEM "' + secret_file.as_uri().encode() + b'">]>\n'
+        + body
+    )
+
+
+SAMPLE_XML = b"""<?xml version="1.0" ?>
+<PubmedArticleSet>
+  <PubmedArticle>
+    <MedlineCitation>
+      <PMID>11111111</PMID>
+      <Article>
+        <ArticleTitle>Company Paper</ArticleTitle>
+        <Journal>
+          <JournalIssue>
+            <PubDate><Year>2023</Year><Month>06</Month><Day>15</Day></PubDate>
+          </JournalIssue>
+        </Journal>
+        <AuthorList>
+          <Author>
+            <LastName>Smith</LastName>
+            <ForeName>John</ForeName>
+            <AffiliationInfo>
+              <Affiliation>Pfizer Inc., New York, NY. john.smith@pfizer.com</Affiliation>
+            </AffiliationInfo>
+          </Author>
+          <Author>
+            <LastName>Doe</LastName>
+            <Initials>J</Initials>
+            <AffiliationInfo>
+              <Affiliation>Harvard University, Boston, MA</Affiliation>
+            </AffiliationInfo>
+          </Author>
+        </AuthorList>
+      </Article>
+    </MedlineCitation>
+  </PubmedArticle>
+  <PubmedArticle>
+    <MedlineCitation>
+      <PMID>22222222</PMID>
+      <Article>
+        <ArticleTitle>Academic Paper</ArticleTitle>
+        <AuthorList>
+          <Author>
+            <LastName>Roe</LastName>
+            <ForeName>Richard</ForeName>
+            <AffiliationInfo>
+              <Affiliation>Stanford University, Stanford, CA</Affiliation>
+            </AffiliationInfo>
+          </Author>
+        </AuthorList>
+      </Article>
+    </MedlineCitation>
+  </PubmedArticle>
+</PubmedArticleSet>
+"""
+
+
+class TestPubMedFetcherParsing:
+    """Test cases for parsing PubMed efetch XML."""
+    
+    def setup_method(self) -> None:
+        """Set up test fixtures."""
+        self.fetcher = PubMedFetcher()
+    
+    @pytest.mark.parametrize("chunk_size", [7, 64, len(SAMPLE_XML)])
+    def test_parse_streamed_chunks(self, chunk_size: int) -> None:
+        """Test that papers are parsed regardless of how the response is chunked."""
+        chunks = [SAMPLE_XML[i:i + chunk_size] for i in range(0, len(SAMPLE_XML), chunk_size)]
+        papers = self.fetcher._parse_paper_details(chunks)
+        
+        # Only the paper with a company-affiliated author is kept
+        assert len(papers) == 1
+        paper = papers[0]
+        assert paper.pubmed_id == "11111111"
+        assert paper.title == "Company Paper"
+        assert paper.publication_date == datetime(2023, 6, 15)
+        assert paper.non_academic_authors == ["Smith, John"]
+        assert len(paper.authors) == 2
+        assert paper.authors[1].name == "Doe, J"
+    
+    def test_fetchers_share_default_detector(self) -> None:
+        """Test that fetchers reuse the module-level detector and its caches."""
+        assert self.fetcher.company_detector is DEFAULT_DETECTOR
+        assert PubMedFetcher().company_detector is DEFAULT_DETECTOR
+    
+    def test_debug_leaves_module_logger_alone(self) -> None:
+        """Test that a debug fetcher doesn't change the shared logger's level."""
+        level = self.fetcher.logger.level
+        PubMedFetcher(debug=True)
+        
+        assert self.fetcher.logger.level == level
+    
+    def test_api_key_is_sent_and_shortens_interval(self) -> None:
+        """Test that an API key is passed to NCBI and allows faster requests."""
+        fetcher = PubMedFetcher(api_key="secret-key")
+        fetcher._rate_limiter = _RateLimiter(0.0)
+        sent: Dict[str, Any] = {}
+        
+        def fake_get(url: str, params: Dict[str, Any], **kwargs: Any) -> _FakeResponse:
+            sent.update(params)
+            return _FakeResponse(b"<eSearchResult><IdList><Id>1</Id></IdList></eSearchResult>")
+        
+        fetcher._session.get = fake_get  # type: ignore[method-assign, assignment]
+        assert fetcher.search_papers("query") == ["1"]
+        
+        assert sent["api_key"] == "secret-key"
+        assert "api_key" not in self.fetcher._api_params({})
+        assert 0.1 < fetcher.request_delay < self.fetcher.request_delay
+        assert PubMedFetcher(api_key="secret-key")._rate_limiter.interval == fetcher.request_delay
+    
+    def test_extract_author_email(self) -> None:
+        """Test that author emails are picked up from the affiliation text."""
+        papers = self.fetcher._parse_paper_details([SAMPLE_XML])
+        
+        assert papers[0].authors[0].email == "john.smith@pfizer.com"
+        assert papers[0].authors[1].email is None
+    
+    def test_company_strings_are_shared(self) -> None:
+        """Test that repeated author and company names share one string object."""
+        # A different affiliation string, so the detector's memoized result
+        # can't hand back the same name object
+        other_xml = SAMPLE_XML.replace(b"New York, NY.", b"Groton, CT.")
+        first = self.fetcher._parse_paper_details([SAMPLE_XML])[0]
+        second = self.fetcher._parse_paper_details([other_xml])[0]
+        
+        assert first.company_affiliations == second.company_affiliations == ["Pfizer Inc.,"]
+        assert first.non_academic_authors[0] is second.non_academic_authors[0]
+        assert first.company_affiliations[0] is second.company_affiliations[0]
+    
+    def test_title_with_inline_markup(self) -> None:
+        """Test that titles keep the text of inline formatting elements."""
+        xml = SAMPLE_XML.replace(
+            b"<ArticleTitle>Company Paper</ArticleTitle>",
+            b"<ArticleTitle>Company <i>in vivo</i> Paper</ArticleTitle>"
+        )
+        papers = self.fetcher._parse_paper_details([xml])
+        
+        assert papers[0].title == "Company in vivo Paper"
+    
+    def test_fetch_batches_keep_order(self) -> None:
+        """Test that concurrently fetched batches are returned in request order."""
+        self.fetcher._rate_limiter = _RateLimiter(0.0)
+        
+        def fake_batch(batch: List[str]) -> List[PaperResult]:
+            # Later batches finish first
+            time.sleep(0.01 * (3 - int(batch[0]) // 200))
+            return [PaperResult(pubmed_id=pmid, title="") for pmid in batch]
+        
+        self.fetcher._fetch_batch_details = fake_batch  # type: ignore[method-assign, assignment]
+        pmids = [str(i) for i in range(450)]
+        papers = self.fetcher.fetch_paper_details(pmids)
+        
+        assert [paper.pubmed_id for paper in papers] == pmids
+    
+    def test_efetch_does_not_expand_external_entities(self, tmp_path: Path) -> None:
+        """Test that SYSTEM entities in an efetch response are not resolved."""
+        secret_file = tmp_path / "secret.txt"
+        secret_file.write_text("TOP SECRET")
+        body = SAMPLE_XML.split(b"?>", 1)[1].replace(
+            b"<ArticleTitle>Company Paper</ArticleTitle>",
+            b"<ArticleTitle>Company &e; Paper</ArticleTitle>"
+        )
+        papers = self.fetcher._parse_paper_details([_external_entity_doc(body, secret_file)])
+        
+        assert papers[0].pubmed_id == "11111111"
+        assert "TOP SECRET" not in papers[0].title
+    
+    def test_esearch_does_not_expand_external_entities(self, tmp_path: Path) -> None:
+        """Test that SYSTEM entities in an esearch response are not resolved."""
+        secret_file = tmp_path / "secret.txt"
+        secret_file.write_text("12345678")
+        body = b"<eSearchResult><IdList><Id>&e;</Id><Id>87654321</Id></IdList></eSearchResult>"
+        response = _FakeResponse(_external_entity_doc(body, secret_file))
+        self.fetcher._session.get = lambda *args, **kwargs: response  # type: ignore[method-assign, assignment]
+        self.fetcher._rate_limiter = _RateLimiter(0.0)
+        
+        assert self.fetcher.search_papers("query") == ["87654321"]
@@ -31,6 +31,11 @@ class TestAuthorInfo:
         assert author.email == "jane.johnson@pfizer.com"
         assert author.is_corresponding is True
         assert author.is_non_academic is True
+    
+    def test_author_uses_slots(self) -> None:
+        """Test that author instances do not carry a per-instance __dict__."""
+        author = AuthorInfo(name="Smith, John")
+        assert not hasattr(author, "__dict__")
 
 
 class TestPaperResult:
@@ -85,4 +90,11 @@ class TestPaperResult:
         assert isinstance(paper.company_affiliations, list)
         assert len(paper.authors) == 0
         assert len(paper.non_academic_authors) == 0
-        assert len(paper.company_affiliations) == 0
\ No newline at end of file
+        assert len(paper.company_affiliations) == 0
+    
+    def test_paper_uses_slots(self) -> None:
+        """Test that paper instances do not carry a per-instance __dict__."""
+        paper = PaperResult(pubmed_id="123", title="Test")
+        assert not hasattr(paper, "__dict__")
+        with pytest.raises(AttributeError):
+            paper.unknown_field = "value"  # type: ignore[attr-defined]